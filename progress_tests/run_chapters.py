@@ -0,0 +1,320 @@
+#
+# Tango with Django 2 Progress Tests
+# By Leif Azzopardi and David Maxwell
+#
+# Cross-Chapter Test Runner
+# Last updated: October 17th, 2026
+#
+
+#
+# Each tests_chapterX.py module expects Rango to be in the state it is at the end of that chapter, so they can't all be run over one codebase.
+# This script runs each chapter's tests against its own copy of a Rango project, several chapters at a time, and merges the results into one report.
+#
+# Unlike the test modules, this script is not copied into your project. Run it from this directory, pointing it at your projects.
+#
+#     $ python run_chapters.py --repo /path/to/tango_with_django_2_code
+#         Uses a checkout of this repository. The chapterX branch is checked out (as a temporary Git worktree) for each chapter.
+#
+#     $ python run_chapters.py --project 5=/path/to/chapter5/project --project 6=/path/to/chapter6/project
+#         Uses your own projects -- each path is the directory containing manage.py. A temporary copy is made of each.
+#
+# Other options:
+#     --chapters 3 4 5       Only run the given chapters (the default is every chapter with a test module).
+#     --workers N            Number of chapters to run at the same time (the default is the number of CPUs).
+#     --python PATH          The Python interpreter to run manage.py with (the default is the one running this script -- so activate your rangoenv!).
+#     --json PATH            Write the merged results to a JSON file.
+#     --junit PATH           Write the merged results to a JUnit XML file, which most continuous integration tools can display.
+#     --slowest N            Number of slowest tests to list at the end (the default is 10).
+#
+# Every chapter gets its own project directory, its own test database and its own process -- so no chapter can interfere with another.
+# The SnapshotTestRunner from twd_runner.py is used for each chapter, with a separate snapshot directory per chapter.
+#
+
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import concurrent.futures
+from xml.etree import ElementTree
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.environ.get('TWD_TEST_SNAPSHOT_DIR', os.path.join(tempfile.gettempdir(), 'twd_test_snapshots'))
+
+# How much of a crashed chapter's output to keep in the report.
+OUTPUT_TAIL_CHARS = 4000
+
+
+def get_available_chapters():
+    """
+    Returns a sorted list of chapter numbers that have a tests_chapterX.py module in this directory.
+    """
+    chapters = []
+
+    for path in glob.glob(os.path.join(TESTS_DIR, 'tests_chapter*.py')):
+        number = os.path.basename(path)[len('tests_chapter'):-len('.py')]
+
+        if number.isdigit():
+            chapters.append(int(number))
+
+    return sorted(chapters)
+
+
+def find_project_dir(root):
+    """
+    Returns the directory beneath root that contains manage.py (the shallowest one), or None if there isn't one.
+    """
+    candidates = glob.glob(os.path.join(root, 'manage.py')) + glob.glob(os.path.join(root, '**', 'manage.py'), recursive=True)
+
+    if not candidates:
+        return None
+
+    return os.path.dirname(min(candidates, key=lambda path: path.count(os.sep)))
+
+
+def prepare_from_repo(repo, chapter, work_dir):
+    """
+    Checks out the chapterX branch of the given repository into a new worktree, returning the project directory.
+    """
+    worktree = os.path.join(work_dir, f'chapter{chapter}')
+
+    for ref in [f'chapter{chapter}', f'origin/chapter{chapter}']:
+        checkout = subprocess.run(['git', '-C', repo, 'worktree', 'add', '--detach', worktree, ref],
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+
+        if checkout.returncode == 0:
+            return find_project_dir(worktree)
+
+    raise RuntimeError(f"Couldn't check out a chapter{chapter} branch from {repo}.{os.linesep}{checkout.stdout}")
+
+
+def prepare_from_project(project, chapter, work_dir):
+    """
+    Copies the given project directory (the one containing manage.py) to a new directory, returning the copy's path.
+    """
+    copy = os.path.join(work_dir, f'chapter{chapter}', os.path.basename(os.path.normpath(project)))
+    shutil.copytree(project, copy, ignore=shutil.ignore_patterns('.git', '__pycache__', '*.pyc'))
+    return copy
+
+
+def install_test_modules(project_dir, chapter):
+    """
+    Copies the chapter's test module, and the twd_runner and twd_markup modules, into the project's rango app.
+    """
+    rango_dir = os.path.join(project_dir, 'rango')
+
+    if not os.path.isdir(rango_dir):
+        raise RuntimeError(f"The project at {project_dir} doesn't have a rango directory.")
+
+    for filename in [f'tests_chapter{chapter}.py', 'twd_runner.py', 'twd_markup.py']:
+        shutil.copy(os.path.join(TESTS_DIR, filename), os.path.join(rango_dir, filename))
+
+
+def run_chapter(chapter, project_dir, python):
+    """
+    Runs the tests for one chapter in a separate process. This is what each worker in the process pool does.
+    Returns a dictionary with the chapter number, the results of each test, the wall time, and the output if something went wrong.
+    """
+    report_path = os.path.join(project_dir, f'twd_report_chapter{chapter}.json')
+    environment = dict(os.environ, TWD_TEST_SNAPSHOT_DIR=os.path.join(SNAPSHOT_DIR, f'chapter{chapter}'))
+    command = [python, 'manage.py', 'test', f'rango.tests_chapter{chapter}', '--noinput',
+               '--testrunner=rango.twd_runner.SnapshotTestRunner', '--slowest=0', f'--json-report={report_path}']
+
+    start = time.perf_counter()
+    process = subprocess.run(command, cwd=project_dir, env=environment,
+                             stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    elapsed = time.perf_counter() - start
+
+    if not os.path.isfile(report_path):
+        return {'chapter': chapter, 'tests': [], 'time': elapsed, 'crashed': True, 'output': process.stdout[-OUTPUT_TAIL_CHARS:]}
+
+    with open(report_path, 'r') as f:
+        report = json.load(f)
+
+    return {'chapter': chapter, 'tests': report['tests'], 'time': elapsed, 'crashed': False, 'output': ''}
+
+
+def count_statuses(tests):
+    counts = {'passed': 0, 'failed': 0, 'error': 0, 'skipped': 0}
+
+    for test in tests:
+        counts[test['status']] += 1
+
+    return counts
+
+
+def get_summary_line(details):
+    """
+    Returns the last non-blank line of a traceback -- the exception and its message.
+    """
+    lines = details.strip().splitlines()
+    return lines[-1] if lines else ''
+
+
+def write_json_report(results, path):
+    with open(path, 'w') as f:
+        json.dump({'chapters': results}, f, indent=2)
+
+
+def write_junit_report(results, path):
+    """
+    Writes the merged results as JUnit XML -- one <testsuite> per chapter. A chapter that crashed is reported as a single error.
+    """
+    suites = ElementTree.Element('testsuites')
+
+    for result in results:
+        counts = count_statuses(result['tests'])
+        suite = ElementTree.SubElement(suites, 'testsuite', name=f"chapter{result['chapter']}",
+                                       tests=str(len(result['tests']) + int(result['crashed'])), failures=str(counts['failed']),
+                                       errors=str(counts['error'] + int(result['crashed'])),
+                                       skipped=str(counts['skipped']), time=f"{result['time']:.3f}")
+
+        for test in result['tests']:
+            case = ElementTree.SubElement(suite, 'testcase', classname=test['class'],
+                                          name=test['id'].rsplit('.', 1)[-1], time=f"{test['time']:.3f}")
+
+            if test['status'] == 'failed':
+                ElementTree.SubElement(case, 'failure', message=get_summary_line(test['details'])).text = test['details']
+            elif test['status'] == 'error':
+                ElementTree.SubElement(case, 'error', message=get_summary_line(test['details'])).text = test['details']
+            elif test['status'] == 'skipped':
+                ElementTree.SubElement(case, 'skipped', message=test['details'])
+
+        if result['crashed']:
+            case = ElementTree.SubElement(suite, 'testcase', classname=f"chapter{result['chapter']}", name='run', time='0')
+            ElementTree.SubElement(case, 'error', message='The test run did not complete.').text = result['output']
+
+    ElementTree.ElementTree(suites).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def print_summary(results, slowest):
+    print(f"{os.linesep}{'Chapter':<10}{'Tests':>7}{'Passed':>8}{'Failed':>8}{'Errors':>8}{'Skipped':>9}{'Time':>10}")
+
+    for result in results:
+        counts = count_statuses(result['tests'])
+        print(f"{result['chapter']:<10}{len(result['tests']):>7}{counts['passed']:>8}{counts['failed']:>8}{counts['error']:>8}{counts['skipped']:>9}{result['time']:>9.2f}s")
+
+    for result in results:
+        if result['crashed']:
+            print(f"{os.linesep}Chapter {result['chapter']} did not complete. The end of its output was:{os.linesep}{result['output']}")
+
+        for test in result['tests']:
+            if test['status'] in ('failed', 'error'):
+                print(f"{os.linesep}{test['status'].upper()}: {test['id']} (Chapter {result['chapter']}){os.linesep}{test['details']}")
+
+    all_tests = [(result['chapter'], test) for result in results for test in result['tests']]
+
+    if slowest > 0 and all_tests:
+        print(f"{os.linesep}Slowest {slowest} tests:")
+
+        for chapter, test in sorted(all_tests, key=lambda item: item[1]['time'], reverse=True)[:slowest]:
+            print(f"{test['time']:>9.3f}s  {test['id']}")
+
+
+def parse_project_arguments(parser, values):
+    """
+    Turns the --project CHAPTER=PATH values into a dictionary mapping chapter numbers to absolute paths. Exits with a usage error if a value is malformed.
+    """
+    projects = {}
+
+    for value in values:
+        chapter, separator, path = value.partition('=')
+
+        if not separator or not chapter.isdigit() or not path:
+            parser.error(f"--project expects CHAPTER=PATH; got '{value}'.")
+
+        projects[int(chapter)] = os.path.abspath(path)
+
+    return projects
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs the Tango with Django progress tests for several chapters in parallel, merging the results.')
+    parser.add_argument('--repo', help='A checkout of the tango_with_django_2_code repository, with chapterX branches.')
+    parser.add_argument('--project', action='append', default=[], metavar='CHAPTER=PATH', help='The project directory (containing manage.py) to test a chapter against.')
+    parser.add_argument('--chapters', type=int, nargs='+', help='The chapters to run (default: all).')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of chapters to run at once.')
+    parser.add_argument('--python', default=sys.executable, help='The Python interpreter to run manage.py with.')
+    parser.add_argument('--json', help='Path to write the merged JSON report to.')
+    parser.add_argument('--junit', help='Path to write the merged JUnit XML report to.')
+    parser.add_argument('--slowest', type=int, default=10, help='Number of slowest tests to list (0 to turn off).')
+    options = parser.parse_args()
+
+    if options.workers is not None and options.workers < 1:
+        parser.error('--workers must be at least 1.')
+
+    if shutil.which(options.python) is None:
+        parser.error(f"The Python interpreter '{options.python}' couldn't be found, or isn't executable.")
+
+    projects = parse_project_arguments(parser, options.project)
+    chapters = options.chapters or (get_available_chapters() if options.repo else sorted(projects))
+
+    if not chapters:
+        parser.error('There are no chapters to run. Use --repo, or give at least one --project CHAPTER=PATH.')
+
+    if not options.repo and not all(chapter in projects for chapter in chapters):
+        parser.error('Without --repo, each chapter needs a --project CHAPTER=PATH.')
+
+    work_dir = tempfile.mkdtemp(prefix='twd_chapters_')
+    worktrees = []
+    results = []
+
+    try:
+        project_dirs = {}
+
+        # Worktrees are set up one at a time; Git doesn't like several being added to a repository at once.
+        for chapter in chapters:
+            try:
+                if chapter in projects:
+                    project_dirs[chapter] = prepare_from_project(projects[chapter], chapter, work_dir)
+                else:
+                    worktrees.append(os.path.join(work_dir, f'chapter{chapter}'))
+                    project_dirs[chapter] = prepare_from_repo(options.repo, chapter, work_dir)
+
+                if project_dirs[chapter] is None:
+                    raise RuntimeError(f"Couldn't find a manage.py for chapter {chapter}.")
+
+                install_test_modules(project_dirs[chapter], chapter)
+            except (RuntimeError, OSError) as e:
+                project_dirs.pop(chapter, None)
+                results.append({'chapter': chapter, 'tests': [], 'time': 0.0, 'crashed': True, 'output': str(e)})
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=options.workers) as pool:
+            futures = {pool.submit(run_chapter, chapter, project_dir, options.python): chapter for chapter, project_dir in project_dirs.items()}
+
+            for future in concurrent.futures.as_completed(futures):
+                # Something going wrong in one chapter's worker shouldn't lose the results of the others.
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'chapter': futures[future], 'tests': [], 'time': 0.0, 'crashed': True, 'output': f'{type(e).__name__}: {e}'}
+
+                results.append(result)
+                counts = count_statuses(result['tests'])
+                print(f"Chapter {result['chapter']}: {counts['passed']}/{len(result['tests'])} passed in {result['time']:.2f}s{' (did not complete)' if result['crashed'] else ''}")
+    finally:
+        for worktree in worktrees:
+            subprocess.run(['git', '-C', options.repo, 'worktree', 'remove', '--force', worktree],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results.sort(key=lambda result: result['chapter'])
+    print_summary(results, options.slowest)
+
+    if options.json:
+        write_json_report(results, options.json)
+
+    if options.junit:
+        write_junit_report(results, options.junit)
+
+    failed = any(result['crashed'] or any(test['status'] in ('failed', 'error') for test in result['tests']) for result in results)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,7 @@
 # With assistance from Enzo Roiz (https://github.com/enzoroiz)
 # 
 # Chapter 4 -- Templates and Media Files
-# Last updated January 25th, 2020
+# Last updated October 17th, 2026
 # Revising Author: David Maxwell
 # 
 
@@ -92,8 +92,16 @@ class Chapter4IndexPageTests(TestCase):
     A series of tests to ensure that the index page/view has been updated to work with templates.
     Image tests are in the Chapter4StaticMediaTests suite.
     """
-    def setUp(self):
-        self.response = self.client.get(reverse('rango:index'))
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # If the request raises, tearDownClass() won't be called for us -- so undo the class-wide setup before reporting the error.
+        try:
+            cls.response = cls.client_class().get(reverse('rango:index'))
+        except Exception:
+            super().tearDownClass()
+            raise
     
     def test_index_uses_template(self):
         """
@@ -210,10 +218,17 @@ class Chapter4ExerciseTests(TestCase):
     """
     A series of tests to ensure that the exercise listing at the end of Chapter 4 has been completed.
     """
-    def setUp(self):
-        self.project_base_dir = os.getcwd()
-        self.template_dir = os.path.join(self.project_base_dir, 'templates', 'rango')
-        self.about_response = self.client.get(reverse('rango:about'))
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.project_base_dir = os.getcwd()
+        cls.template_dir = os.path.join(cls.project_base_dir, 'templates', 'rango')
+
+        try:
+            cls.about_response = cls.client_class().get(reverse('rango:about'))
+        except Exception:
+            super().tearDownClass()
+            raise
     
     def test_about_template_exists(self):
         """
@@ -4,7 +4,7 @@
 # With assistance from Enzo Roiz (https://github.com/enzoroiz)
 # 
 # Chapter 5 -- Models and Databases
-# Last updated: October 3rd, 2019
+# Last updated: October 17th, 2026
 # Revising Author: David Maxwell
 # 
 
@@ -82,7 +82,8 @@ class Chapter5ModelTests(TestCase):
     """
     Are the models set up correctly, and do all the required attributes (post exercises) exist?
     """
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         category_py = Category.objects.get_or_create(name='Python', views=123, likes=55)
         Category.objects.get_or_create(name='Django', views=187, likes=90)
         
@@ -132,17 +133,22 @@ class Chapter5AdminInterfaceTests(TestCase):
     A series of tests that examines the authentication functionality (for superuser creation and logging in), and admin interface changes.
     Have all the admin interface tweaks been applied, and have the two models been added to the admin app?
     """
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
-        Create a superuser account for use in testing.
-        Logs the superuser in, too!
+        Create a superuser account for use in testing, along with a sample category and page.
         """
         User.objects.create_superuser('testAdmin', 'email@email.com', 'adminPassword123')
-        self.client.login(username='testAdmin', password='adminPassword123')
         
         category = Category.objects.get_or_create(name='TestCategory')[0]
         Page.objects.get_or_create(title='TestPage1', url='https://www.google.com', category=category)
     
+    def setUp(self):
+        """
+        Logs the superuser in -- each test gets a fresh client.
+        """
+        self.client.login(username='testAdmin', password='adminPassword123')
+    
     def test_admin_interface_accessible(self):
         response = self.client.get('/admin/')
         self.assertEqual(response.status_code, 200, f"{FAILURE_HEADER}The admin interface is not accessible. Check that you didn't delete the 'admin/' URL pattern in your project's urls.py module.{FAILURE_FOOTER}")
@@ -184,7 +190,8 @@ class Chapter5PopulationScriptTests(TestCase):
     All values that are explicitly mentioned in the book are tested.
     Expects that the population script has the populate() function, as per the book!
     """
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Imports and runs the population script, calling the populate() method.
         """
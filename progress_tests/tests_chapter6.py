@@ -4,12 +4,12 @@
 # With assistance from Enzo Roiz (https://github.com/enzoroiz)
 # 
 # Chapter 6 -- Models, Templates and Views
-# Last updated: October 15th, 2019
+# Last updated: October 17th, 2026
 # Revising Author: David Maxwell
 # 
 
 #
-# In order to run these tests, copy this module to your tango_with_django_project/rango/ directory.
+# In order to run these tests, copy this module and twd_markup.py to your tango_with_django_project/rango/ directory.
 # Once this is complete, run $ python manage.py test rango.tests_chapter6
 # 
 # The tests will then be run, and the output displayed -- do you pass them all?
@@ -18,10 +18,11 @@
 #
 
 import os
-import re  # We use regular expressions to do more in-depth checks on generated HTML output from views.
+import re
 import warnings
 import importlib
 from rango.models import Category, Page
+from rango.twd_markup import MarkupIndex  # Parses the HTML output from views, so we can do more in-depth checks on it.
 from populate_rango import populate
 from django.urls import reverse
 from django.test import TestCase
@@ -31,12 +32,15 @@ from django.db.models.query import QuerySet
 FAILURE_HEADER = f"{os.linesep}{os.linesep}{os.linesep}================{os.linesep}TwD TEST FAILURE =({os.linesep}================{os.linesep}"
 FAILURE_FOOTER = f"{os.linesep}"
 
+WORD_PATTERN = re.compile(r'\w+')
+
 
 class Chapter6PopulationScriptTest(TestCase):
     """
     A few simple tests to examine whether the population script has been updated to include the requested changes (views for pages).
     """
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         populate()
     
     def test_page_objects_have_views(self):
@@ -57,10 +61,22 @@ class Chapter6IndexViewTests(TestCase):
     If tests fail and you can't understand why, maybe it's worth checking out your population script!
     And yes, we assume that all exercises have been completed, too.
     """
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         populate()
-        self.response = self.client.get(reverse('rango:index'))
-        self.content = self.response.content.decode()
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # If the request raises, tearDownClass() won't be called for us -- so undo the class-wide setup before reporting the error.
+        try:
+            cls.response = cls.client_class().get(reverse('rango:index'))
+            cls.content = cls.response.content.decode()
+            cls.markup = MarkupIndex(cls.content)
+        except Exception:
+            super().tearDownClass()
+            raise
     
     def test_template_filename(self):
         """
@@ -93,45 +109,40 @@ class Chapter6IndexViewTests(TestCase):
     def test_index_categories(self):
         """
         Checks the response generated by the index() view -- does it render the categories correctly?
-        Regular expressions are used here (yikes) to try and be as fair as possible when checking the markup received from the developer's project.
+        The response is parsed (rather than matched character for character) to try and be as fair as possible when checking the markup received from the developer's project.
         """
-        category_li_entries_regex = [  # 0 = regex match, 1 = title of category, 2 = sanitised markup for error message
-            [r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("/rango/category/python/"|\'/rango/category/python/\')(\s*)>(\s*|\n*)Python(\s*|\n*)</a>(\s*|\n*)</li>', 'Python', '<li><a href="/rango/category/python/">Python</a></li>'],
-            [r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("/rango/category/django/"|\'/rango/category/django/\')(\s*)>(\s*|\n*)Django(\s*|\n*)</a>(\s*|\n*)</li>', 'Django', '<li><a href="/rango/category/django/">Django</a></li>'],
-            [r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("/rango/category/other-frameworks/"|\'/rango/category/other-frameworks/\')(\s*)>(\s*|\n*)Other Frameworks(\s*|\n*)</a>(\s*|\n*)</li>', 'Other Frameworks', '<li><a href="/rango/category/other-frameworks/">Other Frameworks</a></li>'],
+        category_li_entries = [  # 0 = URL of the category, 1 = title of category, 2 = sanitised markup for error message
+            ['/rango/category/python/', 'Python', '<li><a href="/rango/category/python/">Python</a></li>'],
+            ['/rango/category/django/', 'Django', '<li><a href="/rango/category/django/">Django</a></li>'],
+            ['/rango/category/other-frameworks/', 'Other Frameworks', '<li><a href="/rango/category/other-frameworks/">Other Frameworks</a></li>'],
         ]
 
         # Check for the presence of each entry.
-        for entry in category_li_entries_regex:
-            self.assertTrue(re.search(entry[0], self.content), f"{FAILURE_HEADER}We couldn't find the expected markup '{entry[2]}' (for the {entry[1]} category) in the response of your index() view. Check your template, and try again.{FAILURE_FOOTER}")
+        for entry in category_li_entries:
+            self.assertTrue(self.markup.has_list_item_link(entry[0], entry[1]), f"{FAILURE_HEADER}We couldn't find the expected markup '{entry[2]}' (for the {entry[1]} category) in the response of your index() view. Check your template, and try again.{FAILURE_FOOTER}")
     
     def test_index_pages(self):
         """
         Checks the response generated by the index() view -- does it render the pages correctly?
         As you can set view values to whatever you like for pages (in the population script), we need to be a bit more clever working out what five of the pages should be displayed.
         """
-        page_li_entries_regex = {
-            'Official Python Tutorial': r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://docs.python.org/3/tutorial/"|\'http://docs.python.org/3/tutorial/\')(\s*)>(\s*|\n*)Official Python Tutorial(\s*|\n*)</a>(\s*|\n*)</li>',
-            'How to Think like a Computer Scientist': r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://www.greenteapress.com/thinkpython/"|\'http://www.greenteapress.com/thinkpython/\')(\s*)>(\s*|\n*)How to Think like a Computer Scientist(\s*|\n*)</a>(\s*|\n*)</li>',
-            'Learn Python in 10 Minutes': r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://www.korokithakis.net/tutorials/python/"|\'http://www.korokithakis.net/tutorials/python/\')(\s*)>(\s*|\n*)Learn Python in 10 Minutes(\s*|\n*)</a>(\s*|\n*)</li>',
-            'Official Django Tutorial': r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("https://docs.djangoproject.com/en/2.1/intro/tutorial01/"|\'https://docs.djangoproject.com/en/2.1/intro/tutorial01/\')(\s*)>(\s*|\n*)Official Django Tutorial(\s*|\n*)</a>(\s*|\n*)</li>',
-            'Django Rocks': r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://www.djangorocks.com/"|\'http://www.djangorocks.com/\')(\s*)>(\s*|\n*)Django Rocks(\s*|\n*)</a>(\s*|\n*)</li>',
-            'How to Tango with Django': r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://www.tangowithdjango.com/"|\'http://www.tangowithdjango.com/\')(\s*)>(\s*|\n*)How to Tango with Django(\s*|\n*)</a>(\s*|\n*)</li>',
-            'Bottle': r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://bottlepy.org/docs/dev/"|\'http://bottlepy.org/docs/dev/\')(\s*)>(\s*|\n*)Bottle(\s*|\n*)</a>(\s*|\n*)</li>',
-            'Flask': r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://flask.pocoo.org"|\'http://flask.pocoo.org\')(\s*)>(\s*|\n*)Flask(\s*|\n*)</a>(\s*|\n*)</li>',
+        page_li_entries = {
+            'Official Python Tutorial': 'http://docs.python.org/3/tutorial/',
+            'How to Think like a Computer Scientist': 'http://www.greenteapress.com/thinkpython/',
+            'Learn Python in 10 Minutes': 'http://www.korokithakis.net/tutorials/python/',
+            'Official Django Tutorial': 'https://docs.djangoproject.com/en/2.1/intro/tutorial01/',
+            'Django Rocks': 'http://www.djangorocks.com/',
+            'How to Tango with Django': 'http://www.tangowithdjango.com/',
+            'Bottle': 'http://bottlepy.org/docs/dev/',
+            'Flask': 'http://flask.pocoo.org',
         }
 
         expected_pages_order = list(Page.objects.order_by('-views')[:5])
-        expected_pages_li = []
 
-        # Populate expected_pages_li, picking out the entry from page_li_entries_regex.
+        # Now we have the five pages to look for, we can loop over and check each one exists.
         for expected_page in expected_pages_order:
-            expected_pages_li.append(page_li_entries_regex[expected_page.title])
-        
-        # Now we have the five entries regex to match, we can loop over and check each one exists.
-        for expected_regex in expected_pages_li:
-            print(self.content)
-            self.assertTrue(re.search(expected_regex, self.content), f"{FAILURE_HEADER}Checks for the top five pages in the index() view's response failed. Check you are using the correct list of objects, the correct HTML markup, and try again. '{expected_regex}'{FAILURE_FOOTER}")
+            expected_url = page_li_entries[expected_page.title]
+            self.assertTrue(self.markup.has_list_item_link(expected_url, expected_page.title), f"{FAILURE_HEADER}Checks for the top five pages in the index() view's response failed. Check you are using the correct list of objects, the correct HTML markup, and try again. '<li><a href=\"{expected_url}\">{expected_page.title}</a></li>'{FAILURE_FOOTER}")
         
     def test_index_response_titles(self):
         """
@@ -151,9 +162,16 @@ class Chapter6NoItemsIndexViewTests(TestCase):
     This time, we purposefully do not prepopulate the sample database with data from populate_rango.
     As such, these tests examine whether the app being tested produces the correct output when no categories/pages are present.
     """
-    def setUp(self):
-        self.response = self.client.get(reverse('rango:index'))
-        self.content = self.response.content.decode()
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        try:
+            cls.response = cls.client_class().get(reverse('rango:index'))
+            cls.content = cls.response.content.decode()
+        except Exception:
+            super().tearDownClass()
+            raise
 
     def test_empty_index_context_dictionary(self):
         """
@@ -182,8 +200,8 @@ class Chapter6NoItemsIndexViewTests(TestCase):
         Category.objects.get_or_create(name='Test Category')
         updated_response = self.client.get(reverse('rango:index')).content.decode()
 
-        category_regex = r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("/rango/category/test-category/"|\'/rango/category/test-category/\')(\s*)>(\s*|\n*)Test Category(\s*|\n*)</a>(\s*|\n*)</li>'
-        self.assertTrue(re.search(category_regex, updated_response), f"{FAILURE_HEADER}When adding a test category, we couldn't find the markup for it in the output of the index() view. Check you have included all the code correctly for displaying categories.{FAILURE_FOOTER}")
+        updated_markup = MarkupIndex(updated_response)
+        self.assertTrue(updated_markup.has_list_item_link('/rango/category/test-category/', 'Test Category'), f"{FAILURE_HEADER}When adding a test category, we couldn't find the markup for it in the output of the index() view. Check you have included all the code correctly for displaying categories.{FAILURE_FOOTER}")
         self.assertIn('<strong>There are no pages present.</strong>', self.content, f"{FAILURE_HEADER}When no categories are present, we can't find the required '<strong>There are no pages present.</strong>' markup in your index() view's output. Read the Chapter 6 exercises carefully.{FAILURE_FOOTER}")
 
 class Chapter6CategoryViewTests(TestCase):
@@ -191,10 +209,21 @@ class Chapter6CategoryViewTests(TestCase):
     A series of tests for examining the show_category() view, looking at the context dictionary and rendered response.
     We use the 'Other Frameworks' category for these tests to check the slugs work correctly, too.
     """
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         populate()
-        self.response = self.client.get(reverse('rango:show_category', kwargs={'category_name_slug': 'other-frameworks'}))
-        self.content = self.response.content.decode()
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        try:
+            cls.response = cls.client_class().get(reverse('rango:show_category', kwargs={'category_name_slug': 'other-frameworks'}))
+            cls.content = cls.response.content.decode()
+            cls.markup = MarkupIndex(cls.content)
+        except Exception:
+            super().tearDownClass()
+            raise
     
     def test_template_filename(self):
         """
@@ -232,20 +261,18 @@ class Chapter6CategoryViewTests(TestCase):
         Some simple tests to make sure the markup returned is on track. Specifically, we look at the title and list of pages returned.
         """
         expected_header = '<h1>Other Frameworks</h1>'
-        bottle_markup = r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://bottlepy.org/docs/dev/"|\'http://bottlepy.org/docs/dev/\')(\s*)>(\s*|\n*)Bottle(\s*|\n*)</a>(\s*|\n*)</li>'
-        flask_markup = r'<li>(\s*|\n*)<a(\s+)href(\s*)=(\s*)("http://flask.pocoo.org"|\'http://flask.pocoo.org\')(\s*)>(\s*|\n*)Flask(\s*|\n*)</a>(\s*|\n*)</li>'
 
         self.assertIn(expected_header, self.content, f"{FAILURE_HEADER}The header tag '{expected_header}' was not found in the response for the show_category() view. Make sure the category.html template matches the specification.{FAILURE_FOOTER}")
-        self.assertTrue(re.search(bottle_markup, self.content), f"{FAILURE_HEADER}Correctly formed <li> markup was not found for the pages to be displayed in the show_category() view. Make sure your category.html template is well-formed!{FAILURE_FOOTER}")
-        self.assertTrue(re.search(flask_markup, self.content), f"{FAILURE_HEADER}Correctly formed <li> markup was not found for the pages to be displayed in the show_category() view. Make sure your category.html template is well-formed!{FAILURE_FOOTER}")
+        self.assertTrue(self.markup.has_list_item_link('http://bottlepy.org/docs/dev/', 'Bottle'), f"{FAILURE_HEADER}Correctly formed <li> markup was not found for the pages to be displayed in the show_category() view. Make sure your category.html template is well-formed!{FAILURE_FOOTER}")
+        self.assertTrue(self.markup.has_list_item_link('http://flask.pocoo.org', 'Flask'), f"{FAILURE_HEADER}Correctly formed <li> markup was not found for the pages to be displayed in the show_category() view. Make sure your category.html template is well-formed!{FAILURE_FOOTER}")
 
     def test_for_homepage_link(self):
         """
         Checks to see if a hyperlink to the homepage is present.
         We didn't enforce a strict label for the link; we are more interested here in correct syntax.
         """
-        homepage_hyperlink_markup = r'<a(\s+)href="/rango/">(\w+)</a>'
-        self.assertTrue(re.search(homepage_hyperlink_markup, self.content), f"{FAILURE_HEADER}We couldn't find a well-formed hyperlink to the Rango homepage in your category.html template. This is an exercise at the end of Chapter 6.{FAILURE_FOOTER}")
+        homepage_links = self.markup.get_links('/rango/')
+        self.assertTrue(any(WORD_PATTERN.fullmatch(link.text) and not link.has_children for link in homepage_links), f"{FAILURE_HEADER}We couldn't find a well-formed hyperlink to the Rango homepage in your category.html template. This is an exercise at the end of Chapter 6.{FAILURE_FOOTER}")
 
 class Chapter6BadCategoryViewTests(TestCase):
     """
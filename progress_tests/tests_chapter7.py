@@ -4,7 +4,7 @@
 # With assistance from Enzo Roiz (https://github.com/enzoroiz) and Gerardo A-C (https://github.com/gerac83)
 # 
 # Chapter 7 -- Forms
-# Last updated: January 7th, 2020
+# Last updated: October 17th, 2026
 # Revising Author: David Maxwell
 # 
 
@@ -178,6 +178,10 @@ class Chapter7PageFormAncillaryTests(TestCase):
     """
     Performs a series of tests to check the response of the server under different conditions when adding pages.
     """
+    @classmethod
+    def setUpTestData(cls):
+        populate()
+    
     def test_add_page_url_mapping(self):
         """
         Tests whether the URL mapping for adding a page is resolvable.
@@ -193,7 +197,6 @@ class Chapter7PageFormAncillaryTests(TestCase):
         """
         Checks whether a template was used for the add_page() view.
         """
-        populate()
         response = self.client.get(reverse('rango:add_page', kwargs={'category_name_slug': 'python'}))
         self.assertTemplateUsed(response, 'rango/add_page.html', f"{FAILURE_HEADER}The add_page.html template is not used for the add_page() view. The specification requires this.{FAILURE_FOOTER}")
     
@@ -201,7 +204,6 @@ class Chapter7PageFormAncillaryTests(TestCase):
         """
         Checks whether the template rendering add_page() contains a form, and whether it points to the add_page view.
         """
-        populate()
         response = self.client.get(reverse('rango:add_page', kwargs={'category_name_slug': 'django'}))
         context = response.context
         content = response.content.decode()
@@ -222,8 +224,6 @@ class Chapter7PageFormAncillaryTests(TestCase):
         """
         Given a category and a new page, tests whether the functionality implemented works as expected.
         """
-        populate()
-
         response = self.client.post(reverse('rango:add_page', kwargs={'category_name_slug': 'python'}),
                                             {'title': 'New webpage', 'url': 'www.google.com', 'views': 0})
 
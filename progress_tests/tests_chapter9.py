@@ -4,12 +4,12 @@
 # With assistance from Gerardo A-C (https://github.com/gerac83) and Enzo Roiz (https://github.com/enzoroiz)
 # 
 # Chapter 9 -- Forms
-# Last updated: February 6th, 2020
+# Last updated: October 17th, 2026
 # Revising Author: David Maxwell
 # 
 
 #
-# In order to run these tests, copy this module to your tango_with_django_project/rango/ directory.
+# In order to run these tests, copy this module and twd_markup.py to your tango_with_django_project/rango/ directory.
 # Once this is complete, run $ python manage.py test rango.tests_chapter9
 # 
 # The tests will then be run, and the output displayed -- do you pass them all?
@@ -18,11 +18,11 @@
 #
 
 import os
-import re
 import inspect
 import tempfile
 import rango.models
 from rango import forms
+from rango.twd_markup import get_markup, get_template, has_template_block
 from populate_rango import populate
 from django.db import models
 from django.test import TestCase
@@ -56,19 +56,6 @@ def create_super_user_object():
     """
     return User.objects.create_superuser('admin', 'admin@test.com', 'testpassword')
 
-def get_template(path_to_template):
-    """
-    Helper function to return the string representation of a template file.
-    """
-    f = open(path_to_template, 'r')
-    template_str = ""
-
-    for line in f:
-        template_str = f"{template_str}{line}"
-
-    f.close()
-    return template_str
-
 class Chapter9SetupTests(TestCase):
     """
     A simple test to check whether the auth app has been specified.
@@ -213,14 +200,11 @@ class Chapter9RegistrationTests(TestCase):
         self.assertTrue(os.path.exists(template_path), f"{FAILURE_HEADER}We couldn't find the 'register.html' template in the 'templates/rango/' directory. Did you put it in the right place?{FAILURE_FOOTER}")
 
         template_str = get_template(template_path)
-        full_title_pattern = r'<title>(\s*|\n*)Rango(\s*|\n*)-(\s*|\n*)Register(\s*|\n*)</title>'
-        block_title_pattern = r'{% block title_block %}(\s*|\n*)Register(\s*|\n*){% (endblock|endblock title_block) %}'
 
         request = self.client.get(reverse('rango:register'))
-        content = request.content.decode('utf-8')
 
-        self.assertTrue(re.search(full_title_pattern, content), f"{FAILURE_HEADER}The <title> of the response for 'rango:register' is not correct. Check your register.html template, and try again.{FAILURE_FOOTER}")
-        self.assertTrue(re.search(block_title_pattern, template_str), f"{FAILURE_HEADER}Is register.html using template inheritance? Is your <title> block correct?{FAILURE_FOOTER}")
+        self.assertTrue(get_markup(request).has_title('Rango', 'Register'), f"{FAILURE_HEADER}The <title> of the response for 'rango:register' is not correct. Check your register.html template, and try again.{FAILURE_FOOTER}")
+        self.assertTrue(has_template_block(template_str, 'title_block', 'Register'), f"{FAILURE_HEADER}Is register.html using template inheritance? Is your <title> block correct?{FAILURE_FOOTER}")
 
     def test_registration_get_response(self):
         """
@@ -342,14 +326,11 @@ class Chapter9LoginTests(TestCase):
         self.assertTrue(os.path.exists(template_path), f"{FAILURE_HEADER}We couldn't find the 'login.html' template in the 'templates/rango/' directory. Did you put it in the right place?{FAILURE_FOOTER}")
 
         template_str = get_template(template_path)
-        full_title_pattern = r'<title>(\s*|\n*)Rango(\s*|\n*)-(\s*|\n*)Login(\s*|\n*)</title>'
-        block_title_pattern = r'{% block title_block %}(\s*|\n*)Login(\s*|\n*){% (endblock|endblock title_block) %}'
 
         request = self.client.get(reverse('rango:login'))
-        content = request.content.decode('utf-8')
 
-        self.assertTrue(re.search(full_title_pattern, content), f"{FAILURE_HEADER}The <title> of the response for 'rango:login' is not correct. Check your login.html template, and try again.{FAILURE_FOOTER}")
-        self.assertTrue(re.search(block_title_pattern, template_str), f"{FAILURE_HEADER}Is login.html using template inheritance? Is your <title> block correct?{FAILURE_FOOTER}")
+        self.assertTrue(get_markup(request).has_title('Rango', 'Login'), f"{FAILURE_HEADER}The <title> of the response for 'rango:login' is not correct. Check your login.html template, and try again.{FAILURE_FOOTER}")
+        self.assertTrue(has_template_block(template_str, 'title_block', 'Login'), f"{FAILURE_HEADER}Is login.html using template inheritance? Is your <title> block correct?{FAILURE_FOOTER}")
     
     def test_login_template_content(self):
         """
@@ -507,6 +488,10 @@ class Chapter9ExerciseTests(TestCase):
     A series of tests to check whether the exercises in Chapter 9 have been implemented correctly.
     We check that there is a restricted.html template, whether it uses inheritance, and checks that adding cateories and pages can only be done by a user who is logged in.
     """
+    @classmethod
+    def setUpTestData(cls):
+        populate()
+    
     def test_restricted_template_exists(self):
         """
         Checks whether the restricted.html template exists.
@@ -523,22 +508,18 @@ class Chapter9ExerciseTests(TestCase):
         template_path = os.path.join(template_base_path, 'restricted.html')
 
         template_str = get_template(template_path)
-        full_title_pattern = r'<title>(\s*|\n*)Rango(\s*|\n*)-(\s*|\n*)Restricted Page(\s*|\n*)</title>'
-        block_title_pattern = r'{% block title_block %}(\s*|\n*)Restricted Page(\s*|\n*){% (endblock|endblock title_block) %}'
 
         user_object = create_user_object()
         self.client.login(username='testuser', password='testabc123')
         request = self.client.get(reverse('rango:restricted'))
-        content = request.content.decode('utf-8')
 
-        self.assertTrue(re.search(full_title_pattern, content), f"{FAILURE_HEADER}The <title> of the response for 'rango:restricted' is not correct. Check your restricted.html template, and try again.{FAILURE_FOOTER}")
-        self.assertTrue(re.search(block_title_pattern, template_str), f"{FAILURE_HEADER}Is restricted.html using template inheritance? Is your <title> block correct?{FAILURE_FOOTER}")
+        self.assertTrue(get_markup(request).has_title('Rango', 'Restricted Page'), f"{FAILURE_HEADER}The <title> of the response for 'rango:restricted' is not correct. Check your restricted.html template, and try again.{FAILURE_FOOTER}")
+        self.assertTrue(has_template_block(template_str, 'title_block', 'Restricted Page'), f"{FAILURE_HEADER}Is restricted.html using template inheritance? Is your <title> block correct?{FAILURE_FOOTER}")
     
     def test_bad_add_page(self):
         """
         Tests to see if a page cannot be added when not logged in.
         """
-        populate()
         response = self.client.get(reverse('rango:add_page', kwargs={'category_name_slug': 'python'}))
         
         self.assertEqual(response.status_code, 302, f"{FAILURE_HEADER}When not logged in and attempting to add a page, we should be redirected. But we weren't. Check your add_page() implementation.{FAILURE_FOOTER}")
@@ -557,7 +538,6 @@ class Chapter9ExerciseTests(TestCase):
         """
         Tests to see if a page can be added when logged in.
         """
-        populate()
         user_object = create_user_object()
         self.client.login(username='testuser', password='testabc123')
         response = self.client.get(reverse('rango:add_page', kwargs={'category_name_slug': 'python'}))
@@ -598,7 +578,6 @@ class Chapter9ExerciseTests(TestCase):
         """
         Tests to see if the Add Page link only appears when logged in.
         """
-        populate()
         content = self.client.get(reverse('rango:show_category', kwargs={'category_name_slug': 'python'})).content.decode()
         
         self.assertTrue(reverse('rango:add_page', kwargs={'category_name_slug': 'python'}) not in content, f"{FAILURE_HEADER}The Add Page link was present in the show_category() response when a user was not logged in. It shouldn't be there. Did you do the exercises?{FAILURE_FOOTER}")
@@ -0,0 +1,324 @@
+#
+# Tango with Django 2 Progress Tests
+# By Leif Azzopardi and David Maxwell
+#
+# Performance Regression Benchmarks (any chapter from Chapter 6 onwards)
+# Last updated: October 17th, 2026
+#
+
+#
+# In order to run these benchmarks, copy this module to your tango_with_django_project/rango/ directory.
+# Once this is complete, run $ python manage.py test rango.tests_performance
+#
+# Every URL mapping in the rango namespace is requested a number of times, both as an anonymous user and as a logged in user.
+# For each one, we record the number of queries issued, time spent in the database, time spent rendering templates, and p50/p95/p99 latencies.
+# These figures are compared against a baseline JSON file -- if a view issues more queries than before, or becomes a lot slower, the tests fail.
+#
+# The benchmarks can be configured with the following environment variables.
+#     TWD_BENCH_CATEGORIES           Number of synthetic categories to create on top of populate_rango (default 50).
+#     TWD_BENCH_PAGES_PER_CATEGORY   Number of synthetic pages per synthetic category (default 20).
+#     TWD_BENCH_ITERATIONS           Number of timed requests per URL mapping (default 30).
+#     TWD_BENCH_WARMUP               Number of untimed requests per URL mapping, made before timing starts (default 2).
+#     TWD_BENCH_BASELINE             Path to the baseline JSON file (default benchmark_baseline.json, next to this module).
+#     TWD_BENCH_UPDATE_BASELINE      Set to 1 to write the figures from this run to the baseline file instead of comparing.
+#     TWD_BENCH_LATENCY_TOLERANCE    How many times slower than the baseline p95 a view may be before failing (default 1.5).
+#
+# Once you are done with the benchmarks, delete the module. You don't need to put it in your Git repository!
+#
+
+import os
+import json
+import math
+import time
+import warnings
+from rango.models import Category, Page
+from populate_rango import populate
+from django.test import TestCase
+from django.db import connection
+from django.urls import reverse, get_resolver, NoReverseMatch
+from django.template.defaultfilters import slugify
+from django.template.backends.django import Template as BackendTemplate
+from django.contrib.auth.models import User
+
+FAILURE_HEADER = f"{os.linesep}{os.linesep}{os.linesep}================{os.linesep}TwD TEST FAILURE =({os.linesep}================{os.linesep}"
+FAILURE_FOOTER = f"{os.linesep}"
+
+BENCH_CATEGORIES = int(os.environ.get('TWD_BENCH_CATEGORIES', 50))
+BENCH_PAGES_PER_CATEGORY = int(os.environ.get('TWD_BENCH_PAGES_PER_CATEGORY', 20))
+BENCH_ITERATIONS = int(os.environ.get('TWD_BENCH_ITERATIONS', 30))
+BENCH_WARMUP = int(os.environ.get('TWD_BENCH_WARMUP', 2))
+BENCH_BASELINE = os.environ.get('TWD_BENCH_BASELINE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json'))
+BENCH_UPDATE_BASELINE = os.environ.get('TWD_BENCH_UPDATE_BASELINE', '') == '1'
+BENCH_LATENCY_TOLERANCE = float(os.environ.get('TWD_BENCH_LATENCY_TOLERANCE', 1.5))
+
+# Latencies this small are mostly noise; a regression needs to be at least this much slower (in milliseconds) to count.
+LATENCY_SLACK_MS = 5.0
+
+# Values used to fill in URL parameters when reversing a mapping. Python is created by populate_rango.
+URL_KWARGS = {
+    'category_name_slug': 'python',
+}
+
+
+def create_synthetic_data(category_count, pages_per_category):
+    """
+    Helper function to add a large number of categories and pages on top of what populate_rango provides.
+    bulk_create() skips Category.save(), so slugs are worked out here.
+    """
+    categories = []
+
+    for i in range(category_count):
+        name = f'Benchmark Category {i:05d}'
+        categories.append(Category(name=name, slug=slugify(name), views=i, likes=i % 97))
+
+    Category.objects.bulk_create(categories, batch_size=500)
+    categories = Category.objects.filter(name__startswith='Benchmark Category ')
+
+    pages = []
+
+    for category in categories:
+        for j in range(pages_per_category):
+            pages.append(Page(category=category,
+                              title=f'{category.name} Page {j:04d}',
+                              url=f'http://www.example.com/{category.slug}/{j}/',
+                              views=(category.views * pages_per_category + j) % 1000 + 1))
+
+    Page.objects.bulk_create(pages, batch_size=500)
+
+
+def get_rango_url_names():
+    """
+    Helper function to return a sorted list of the URL mapping names in the rango namespace.
+    """
+    rango_resolver = get_resolver().namespace_dict['rango'][1]
+    return sorted(name for name in rango_resolver.reverse_dict.keys() if isinstance(name, str))
+
+
+def reverse_with_kwargs(url_name):
+    """
+    Helper function to reverse a rango URL mapping, filling in any parameters from URL_KWARGS.
+    Returns None if the mapping takes a parameter that we don't know how to fill in.
+    """
+    try:
+        return reverse(f'rango:{url_name}')
+    except NoReverseMatch:
+        pass
+
+    rango_resolver = get_resolver().namespace_dict['rango'][1]
+
+    for possibility, pattern, defaults, converters in rango_resolver.reverse_dict.getlist(url_name):
+        for result, params in possibility:
+            if all(param in URL_KWARGS for param in params):
+                return reverse(f'rango:{url_name}', kwargs={param: URL_KWARGS[param] for param in params})
+
+    return None
+
+
+def percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile of a list of values that has already been sorted.
+    """
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class QueryTimer:
+    """
+    A database execute wrapper that counts queries and measures the time spent running them.
+    Install it with connection.execute_wrapper(). The times Django records in connection.queries are rounded to the millisecond, which is too coarse here.
+    """
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.elapsed += time.perf_counter() - start
+            self.count += 1
+
+
+class RenderTimer:
+    """
+    Wraps the Django template backend's render() method to measure time spent rendering.
+    Only top-level renders are counted, so {% extends %} and {% include %} are not counted twice.
+    Note that querysets evaluated inside a template are counted as render time here, too.
+    """
+    def __init__(self):
+        self.elapsed = 0.0
+        self.depth = 0
+        self.original_render = None
+
+    def start(self):
+        timer = self
+        original_render = BackendTemplate.render
+        self.original_render = original_render
+
+        def timed_render(template, *args, **kwargs):
+            timer.depth += 1
+            start = time.perf_counter()
+
+            try:
+                return original_render(template, *args, **kwargs)
+            finally:
+                timer.depth -= 1
+
+                if timer.depth == 0:
+                    timer.elapsed += time.perf_counter() - start
+
+        BackendTemplate.render = timed_render
+
+    def stop(self):
+        BackendTemplate.render = self.original_render
+
+
+class PerformanceBenchmarkTests(TestCase):
+    """
+    Requests every rango URL mapping, anonymously and when logged in, and compares the figures against the stored baseline.
+    The dataset is built once for the whole class; populate_rango is run first, followed by the synthetic generator.
+    """
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        populate()
+        create_synthetic_data(BENCH_CATEGORIES, BENCH_PAGES_PER_CATEGORY)
+        User.objects.create_user('benchuser', 'bench@test.com', 'benchpassword123')
+
+    @classmethod
+    def setUpClass(cls):
+        # The baseline is loaded first, and the render timer started last -- if either raises, tearDownClass() isn't called to undo what came before.
+        cls.baseline = cls.load_baseline()
+        super().setUpClass()
+        cls.render_timer = RenderTimer()
+        cls.render_timer.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.render_timer.stop()
+        cls.print_report()
+
+        if BENCH_UPDATE_BASELINE:
+            cls.save_baseline()
+
+        super().tearDownClass()
+
+    @classmethod
+    def get_dataset_description(cls):
+        return {'categories': BENCH_CATEGORIES, 'pages_per_category': BENCH_PAGES_PER_CATEGORY}
+
+    @classmethod
+    def load_baseline(cls):
+        """
+        Loads the baseline JSON file. Returns None (with a warning) if there is nothing to compare against.
+        """
+        if BENCH_UPDATE_BASELINE:
+            return None
+
+        if not os.path.exists(BENCH_BASELINE):
+            warnings.warn(f"No benchmark baseline was found at {BENCH_BASELINE}. Figures will be reported, but not compared. Run again with TWD_BENCH_UPDATE_BASELINE=1 to create one.")
+            return None
+
+        with open(BENCH_BASELINE, 'r') as f:
+            baseline = json.load(f)
+
+        if baseline.get('dataset') != cls.get_dataset_description():
+            warnings.warn(f"The benchmark baseline at {BENCH_BASELINE} was recorded with a different dataset ({baseline.get('dataset')}). Figures will be reported, but not compared.")
+            return None
+
+        return baseline['results']
+
+    @classmethod
+    def save_baseline(cls):
+        with open(BENCH_BASELINE, 'w') as f:
+            json.dump({'dataset': cls.get_dataset_description(), 'results': cls.results}, f, indent=2, sort_keys=True)
+
+    @classmethod
+    def print_report(cls):
+        if not cls.results:
+            return
+
+        print(f"{os.linesep}{'URL mapping':<40}{'queries':>8}{'db ms':>10}{'render ms':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+
+        for key in sorted(cls.results.keys()):
+            result = cls.results[key]
+            print(f"{key:<40}{result['queries']:>8}{result['db_ms']:>10.2f}{result['render_ms']:>11.2f}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}")
+
+    def measure(self, url):
+        """
+        Requests the given URL BENCH_ITERATIONS times, returning a dictionary of figures.
+        Query counts and times are per request; the query count is the largest seen over all iterations.
+        """
+        for i in range(BENCH_WARMUP):
+            self.client.get(url)
+
+        latencies = []
+        max_queries = 0
+        db_time = 0.0
+        self.render_timer.elapsed = 0.0
+
+        for i in range(BENCH_ITERATIONS):
+            if self.user is not None and '_auth_user_id' not in self.client.session:
+                self.client.force_login(self.user)  # Some views (logout!) end the session.
+
+            query_timer = QueryTimer()
+
+            with connection.execute_wrapper(query_timer):
+                start = time.perf_counter()
+                self.client.get(url)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            max_queries = max(max_queries, query_timer.count)
+            db_time += query_timer.elapsed
+
+        latencies.sort()
+
+        return {'queries': max_queries,
+                'db_ms': db_time * 1000 / BENCH_ITERATIONS,
+                'render_ms': self.render_timer.elapsed * 1000 / BENCH_ITERATIONS,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99)}
+
+    def run_benchmarks(self, mode):
+        """
+        Measures every rango URL mapping for the given mode, and checks the results against the baseline.
+        """
+        for url_name in get_rango_url_names():
+            url = reverse_with_kwargs(url_name)
+            key = f'{mode}:rango:{url_name}'
+
+            if url is None:
+                warnings.warn(f"Skipping the benchmark for 'rango:{url_name}'; we don't know how to fill in its URL parameters. Add them to URL_KWARGS.")
+                continue
+
+            with self.subTest(url_name=url_name):
+                result = self.measure(url)
+                self.__class__.results[key] = result
+
+                if self.baseline is None or key not in self.baseline:
+                    continue
+
+                expected = self.baseline[key]
+                latency_limit = expected['p95_ms'] * BENCH_LATENCY_TOLERANCE + LATENCY_SLACK_MS
+
+                self.assertLessEqual(result['queries'], expected['queries'], f"{FAILURE_HEADER}GET '{url}' ({mode}) issued {result['queries']} queries; the baseline is {expected['queries']}. Has a change introduced extra (perhaps N+1) queries?{FAILURE_FOOTER}")
+                self.assertLessEqual(result['p95_ms'], latency_limit, f"{FAILURE_HEADER}GET '{url}' ({mode}) had a p95 latency of {result['p95_ms']:.2f}ms; the baseline is {expected['p95_ms']:.2f}ms (limit {latency_limit:.2f}ms).{FAILURE_FOOTER}")
+
+    def test_anonymous_requests(self):
+        """
+        Benchmarks each rango URL mapping without logging in.
+        """
+        self.user = None
+        self.run_benchmarks('anonymous')
+
+    def test_authenticated_requests(self):
+        """
+        Benchmarks each rango URL mapping as a logged in user.
+        """
+        self.user = User.objects.get(username='benchuser')
+        self.client.force_login(self.user)
+        self.run_benchmarks('authenticated')
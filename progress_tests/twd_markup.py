@@ -0,0 +1,184 @@
+#
+# Tango with Django 2 Progress Tests
+# By Leif Azzopardi and David Maxwell
+#
+# Markup Helpers for the Progress Tests
+# Last updated: October 17th, 2026
+#
+
+#
+# This module is used by some of the tests_chapterX.py modules to check the HTML produced by your views, and the source of your templates.
+# Copy it to your tango_with_django_project/rango/ directory, alongside the test module you are running.
+#
+# Rendered pages are parsed once, with Python's built-in HTML parser, into a small index of their links, list items and title.
+# This means we don't need to run big regular expressions over every response -- and whitespace and quote styles don't trip anyone up.
+#
+# Once you are done with the tests, delete the module. You don't need to put it in your Git repository!
+#
+
+import re
+import functools
+from collections import namedtuple
+from html.parser import HTMLParser
+
+# Elements that never have a closing tag.
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# A hyperlink found in a page.
+# attrs is the list of (name, value) attribute pairs, text is the text directly inside the <a> element, and has_children is True if the <a> contains other elements.
+# in_list_item is True if the link is the only thing (other than whitespace) inside an attribute-less <li> element.
+Link = namedtuple('Link', ['href', 'attrs', 'text', 'has_children', 'in_list_item'])
+
+
+def normalise_whitespace(text):
+    """
+    Collapses each run of whitespace in the given string to a single space, and strips the ends.
+    """
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+class MarkupIndex(HTMLParser):
+    """
+    Parses a rendered page once, indexing its links and <title>.
+    Each element is visited once while parsing, so building the index (and most queries) take time in proportion to the size of the page.
+    """
+    def __init__(self, content):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.title = None
+        self._open_elements = []
+        self.feed(content)
+        self.close()
+
+        # Anything left unclosed at the end of the page is closed now.
+        while self._open_elements:
+            self._close_element()
+
+    def handle_starttag(self, tag, attrs):
+        if self._open_elements:
+            self._open_elements[-1]['children'].append(tag)
+
+        if tag not in VOID_ELEMENTS:
+            self._open_elements.append({'tag': tag, 'attrs': attrs, 'text': [], 'all_text': [], 'children': [], 'links': []})
+
+    def handle_startendtag(self, tag, attrs):
+        if self._open_elements:
+            self._open_elements[-1]['children'].append(tag)
+
+    def handle_endtag(self, tag):
+        # Only close up to a matching open element; stray closing tags are ignored.
+        if not any(element['tag'] == tag for element in self._open_elements):
+            return
+
+        while self._close_element()['tag'] != tag:
+            pass
+
+    def handle_data(self, data):
+        if self._open_elements:
+            self._open_elements[-1]['text'].append(data)
+            self._open_elements[-1]['all_text'].append(data)
+
+    def _close_element(self):
+        element = self._open_elements.pop()
+        all_text = ''.join(element['all_text'])
+        parent = self._open_elements[-1] if self._open_elements else None
+
+        if parent is not None:
+            parent['all_text'].append(all_text)
+
+        if element['tag'] == 'a':
+            link = Link(href=dict(element['attrs']).get('href'),
+                        attrs=element['attrs'],
+                        text=''.join(element['text']),
+                        has_children=bool(element['children']),
+                        in_list_item=False)
+            self.links.append(link)
+
+            if parent is not None:
+                parent['links'].append(len(self.links) - 1)
+        elif element['tag'] == 'li':
+            if not element['attrs'] and element['children'] == ['a'] and not ''.join(element['text']).strip():
+                link_index = element['links'][0]
+                self.links[link_index] = self.links[link_index]._replace(in_list_item=True)
+        elif element['tag'] == 'title' and self.title is None:
+            self.title = all_text
+
+        return element
+
+    def get_links(self, href):
+        """
+        Returns a list of the plain links (<a> elements with a href attribute, and no other attributes) pointing to the given URL.
+        """
+        return [link for link in self.links if link.attrs == [('href', href)]]
+
+    def has_list_item_link(self, href, text):
+        """
+        Is there an <li><a href="href">text</a></li> list item in the page? Whitespace around the elements and the text is allowed.
+        """
+        return any(link.in_list_item and link.text.strip() == text and not link.has_children for link in self.get_links(href))
+
+    def has_title(self, site_title, page_title):
+        """
+        Does the page's <title> read '<site_title> - <page_title>'? Any amount of whitespace is allowed around the parts.
+        """
+        if self.title is None:
+            return False
+
+        site_part, separator, page_part = self.title.partition('-')
+        return separator == '-' and normalise_whitespace(site_part) == site_title and normalise_whitespace(page_part) == page_title
+
+
+def get_markup(response):
+    """
+    Returns the MarkupIndex for a response from the test client. The response is only parsed the first time this is called for it.
+    """
+    markup = getattr(response, '_twd_markup', None)
+
+    if markup is None:
+        markup = MarkupIndex(response.content.decode())
+        response._twd_markup = markup
+
+    return markup
+
+
+def get_template(path_to_template):
+    """
+    Returns the source of a template file as a string.
+    """
+    with open(path_to_template, 'r') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=None)
+def template_tokens_pattern(*tokens):
+    """
+    Returns a compiled pattern matching the given tokens in order, separated by any amount of whitespace (including none).
+    Each token is matched literally, unless it is a tuple -- in which case any one of the strings in the tuple may match.
+    Patterns are compiled once, and reused for later calls with the same tokens.
+    """
+    parts = []
+
+    for token in tokens:
+        if isinstance(token, tuple):
+            parts.append(f"(?:{'|'.join(re.escape(alternative) for alternative in token)})")
+        else:
+            parts.append(re.escape(token))
+
+    return re.compile(r'\s*'.join(parts))
+
+
+def endblock_tokens(block_name):
+    """
+    Returns the token for the end of a block -- either {% endblock %} or {% endblock block_name %} is accepted.
+    """
+    return ('{% endblock %}', f'{{% endblock {block_name} %}}')
+
+
+def has_template_block(template_str, block_name, *contents):
+    """
+    Does the template source define the given block, containing exactly the given tokens (separated by any amount of whitespace)?
+    """
+    tokens = (f'{{% block {block_name} %}}',) + contents + (endblock_tokens(block_name),)
+    return template_tokens_pattern(*tokens).search(template_str) is not None
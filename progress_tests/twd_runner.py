@@ -0,0 +1,476 @@
+#
+# Tango with Django 2 Progress Tests
+# By Leif Azzopardi and David Maxwell
+#
+# Test Runner with Timing Reports
+# Last updated: October 17th, 2026
+#
+
+#
+# In order to use this test runner, copy this module to your tango_with_django_project/rango/ directory, alongside the tests_chapterX.py module you want to run.
+# Then run $ python manage.py test rango.tests_chapter6 --testrunner=rango.twd_runner.TimedTestRunner
+#
+# The tests run exactly as they would with Django's default test runner.
+# Once they have finished, a report listing how long each test class took (including class-level setup and teardown) is printed, slowest first.
+# Use --slowest N to also list the N slowest individual tests (the default is 10; use 0 to turn this off).
+# Use --json-report PATH to save the outcome and duration of every test to a JSON file.
+# Timings can't be taken when tests run in parallel processes (--parallel), so no timing report is printed then. The outcome of each test is still saved with --json-report.
+#
+# If you are using SQLite (the default for Rango), you can use --testrunner=rango.twd_runner.SnapshotTestRunner instead.
+# This does everything the TimedTestRunner does, but also skips migrating a brand new test database on every run.
+# The first run migrates the test database as normal, and saves a copy of it (a snapshot). Later runs start from a copy of that snapshot.
+# Snapshots are matched to a fingerprint of your migration files, so if you add or change a migration, a new snapshot is made automatically.
+# Snapshots are stored in your system's temporary directory (with a separate directory for each project), unless you set the TWD_TEST_SNAPSHOT_DIR environment variable to somewhere else.
+#
+# Once you are done with the tests, delete the module. You don't need to put it in your Git repository!
+#
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+import unittest
+import django
+from django.apps import apps
+from django.db import connections
+from django.conf import settings
+from django.db.migrations.loader import MigrationLoader
+from django.test.runner import DiscoverRunner, DebugSQLTextTestResult, ParallelTestSuite
+
+SNAPSHOT_DIR = os.environ.get('TWD_TEST_SNAPSHOT_DIR')
+DEFAULT_SNAPSHOT_ROOT = os.path.join(tempfile.gettempdir(), 'twd_test_snapshots')
+
+
+# unittest reports errors from class and module fixtures against a stand-in _ErrorHolder, described as 'setUpClass (module.ClassName)'.
+ERROR_HOLDER_PATTERN = re.compile(r'^(?P<fixture>\w+) \((?P<scope>.+)\)$')
+
+
+def iter_test_cases(suite):
+    """
+    Helper function to yield each individual test from a (possibly nested) test suite.
+    """
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_test_cases(test)
+        else:
+            yield test
+
+
+class TimedTestResultMixin:
+    """
+    Records the time taken by each individual test, from startTest() to stopTest(), along with its outcome.
+    Results are kept in test_timings, as a list of dictionaries with the keys id, class, time (in seconds), status and details.
+    The status is one of passed, failed, error or skipped. Errors raised outside of a test (in setUpClass(), for example) are recorded too.
+    These are also kept in fixture_errors, as a list of dictionaries with the keys fixture, scope (the class or module it belongs to) and details.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.test_timings = []
+        self.fixture_errors = []
+        self._current_test = None
+        self._test_started = None
+        self._test_outcome = None
+
+    def startTest(self, test):
+        self._current_test = test
+        self._test_outcome = ('passed', '')
+        self._test_started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        elapsed = time.perf_counter() - self._test_started
+        self.add_timing(test, elapsed, *self._test_outcome)
+        self._current_test = None
+
+    def add_timing(self, test, elapsed, status, details):
+        self.test_timings.append({'id': test.id(),
+                                  'class': f'{test.__class__.__module__}.{test.__class__.__qualname__}',
+                                  'time': elapsed,
+                                  'status': status,
+                                  'details': details})
+
+    def set_outcome(self, test, status, details):
+        """
+        Records the outcome of the running test. The first problem reported (for a test with several subtests, say) is kept.
+        """
+        if test is not self._current_test:
+            self.add_fixture_error(test, status, details)
+        elif self._test_outcome[0] == 'passed':
+            self._test_outcome = (status, details)
+
+    def add_fixture_error(self, holder, status, details):
+        """
+        Records an error from a class or module fixture. These aren't tests at all; unittest reports them with an error holder.
+        The holder's description gives the fixture and the class (or module) it belongs to, which we record in place of the holder's own class.
+        """
+        description = getattr(holder, 'description', holder.id())
+        match = ERROR_HOLDER_PATTERN.match(description)
+        fixture, scope = match.group('fixture', 'scope') if match else ('fixture', description)
+
+        self.fixture_errors.append({'fixture': fixture, 'scope': scope, 'details': details})
+        self.test_timings.append({'id': f'{scope}.{fixture}',
+                                  'class': scope,
+                                  'time': 0.0,
+                                  'status': status,
+                                  'details': details})
+
+    def add_unrun_tests(self, tests):
+        """
+        Records each of the given tests that never ran because the setUpClass() or setUpModule() it needed failed, as an error.
+        Without this, the tests of a class that failed to set up would silently vanish from the report.
+        """
+        recorded_ids = {timing['id'] for timing in self.test_timings}
+        failed_setups = {error['scope']: error for error in self.fixture_errors if error['fixture'] in ('setUpClass', 'setUpModule')}
+
+        for test in tests:
+            if test.id() in recorded_ids:
+                continue
+
+            error = failed_setups.get(f'{test.__class__.__module__}.{test.__class__.__qualname__}') or failed_setups.get(test.__class__.__module__)
+
+            if error is not None:
+                self.add_timing(test, 0.0, 'error', f"This test did not run, because {error['fixture']}() failed for {error['scope']}.")
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.set_outcome(test, 'error', self._exc_info_to_string(err, test))
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.set_outcome(test, 'failed', self._exc_info_to_string(err, test))
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self.set_outcome(test, 'skipped', reason)
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self.set_outcome(test, 'failed', 'Unexpected success.')
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+
+        if err is not None:
+            status = 'failed' if issubclass(err[0], test.failureException) else 'error'
+            self.set_outcome(test, status, self._exc_info_to_string(err, test))
+
+
+class TimedTextTestResult(TimedTestResultMixin, unittest.TextTestResult):
+    pass
+
+
+class TimedDebugSQLTextTestResult(TimedTestResultMixin, DebugSQLTextTestResult):
+    pass
+
+
+class TimedTestRunner(DiscoverRunner):
+    """
+    A drop-in replacement for Django's DiscoverRunner that prints a timing report for each test class.
+    Class-level setup (setUpClass(), including setUpTestData()) and teardown is timed by wrapping each class's fixture methods.
+    """
+    def __init__(self, slowest=10, json_report=None, **kwargs):
+        super().__init__(**kwargs)
+        self.slowest = slowest
+        self.json_report = json_report
+        self.class_fixture_timings = {}
+        self.classes_being_timed = set()
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--slowest', type=int, default=10,
+                            help='Number of slowest individual tests to list in the timing report (0 to turn off).')
+        parser.add_argument('--json-report', default=None,
+                            help='Path of a JSON file to write the outcome and duration of each test to.')
+
+    def get_resultclass(self):
+        return TimedDebugSQLTextTestResult if self.debug_sql else TimedTextTestResult
+
+    def time_class_fixture(self, test_class, method_name):
+        """
+        Replaces the given class-level fixture method (setUpClass or tearDownClass) with one that records how long it took.
+        The wrapper is set on the class itself, and calls the original function with the class being set up -- so subclasses still run their own setUpTestData().
+        """
+        original_method = getattr(test_class, method_name).__func__
+        original_method = getattr(original_method, 'untimed_method', original_method)  # Inherited from a class we've already wrapped.
+        timings = self.class_fixture_timings
+        classes_being_timed = self.classes_being_timed
+
+        def timed_method(cls):
+            # Reached through super() from a subclass's fixture, which is already being timed.
+            if cls in classes_being_timed:
+                return original_method(cls)
+
+            class_name = f'{cls.__module__}.{cls.__qualname__}'
+            classes_being_timed.add(cls)
+            start = time.perf_counter()
+
+            try:
+                original_method(cls)
+            finally:
+                classes_being_timed.discard(cls)
+                timings[class_name] = timings.get(class_name, 0.0) + time.perf_counter() - start
+
+        timed_method.untimed_method = original_method
+        setattr(test_class, method_name, classmethod(timed_method))
+
+    def run_suite(self, suite, **kwargs):
+        # With --parallel, the tests (and their class-level fixtures) run in worker processes; only their results are sent back to us.
+        # The times we would see here are just how long it took to replay those results, so we don't report them.
+        timed = not isinstance(suite, ParallelTestSuite)
+        tests = list(iter_test_cases(suite if timed else suite.subsuites))
+
+        if timed:
+            test_classes = []
+
+            for test in tests:
+                if test.__class__ not in test_classes:
+                    test_classes.append(test.__class__)
+
+            for test_class in test_classes:
+                self.time_class_fixture(test_class, 'setUpClass')
+                self.time_class_fixture(test_class, 'tearDownClass')
+
+        result = super().run_suite(suite, **kwargs)
+        result.add_unrun_tests(tests)
+
+        if timed:
+            self.print_timing_report(result)
+        else:
+            print(f"{os.linesep}No timing report: tests run with --parallel can't be timed. Run the tests without --parallel to see how long they take.")
+
+        if self.json_report:
+            self.write_json_report(result, timed)
+
+        return result
+
+    def write_json_report(self, result, timed=True):
+        report = {'timed': timed,
+                  'tests': result.test_timings,
+                  'class_fixture_timings': self.class_fixture_timings}
+
+        with open(self.json_report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    def get_class_timings(self, result):
+        """
+        Returns a dictionary mapping each test class name to the total time spent on it, in seconds.
+        """
+        class_timings = dict(self.class_fixture_timings)
+
+        for timing in result.test_timings:
+            class_timings[timing['class']] = class_timings.get(timing['class'], 0.0) + timing['time']
+
+        return class_timings
+
+    def print_timing_report(self, result):
+        class_timings = self.get_class_timings(result)
+
+        if not class_timings:
+            return
+
+        print(f"{os.linesep}Time per test class (including class-level setup and teardown), slowest first:")
+
+        for class_name, elapsed in sorted(class_timings.items(), key=lambda item: item[1], reverse=True):
+            print(f"{elapsed:>9.3f}s  {class_name}")
+
+        print(f"{sum(class_timings.values()):>9.3f}s  Total")
+
+        if self.slowest > 0:
+            print(f"{os.linesep}Slowest {self.slowest} tests:")
+
+            for timing in sorted(result.test_timings, key=lambda item: item['time'], reverse=True)[:self.slowest]:
+                print(f"{timing['time']:>9.3f}s  {timing['id']}")
+
+
+def get_migrations_fingerprint():
+    """
+    Returns a hash of everything that decides what a freshly migrated database looks like.
+    That is the Django version, INSTALLED_APPS, the contents of every migration file, and the models modules of any apps without migrations.
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    fingerprint = hashlib.sha256()
+    fingerprint.update(django.get_version().encode())
+    fingerprint.update(repr(list(settings.INSTALLED_APPS)).encode())
+    source_files = []
+
+    for (app_label, migration_name), migration in loader.disk_migrations.items():
+        source_files.append((app_label, migration_name, sys.modules[migration.__module__].__file__))
+
+    for app_label in loader.unmigrated_apps:
+        models_module = apps.get_app_config(app_label).models_module
+
+        if models_module is not None:
+            source_files.append((app_label, '', models_module.__file__))
+
+    for app_label, migration_name, path in sorted(source_files):
+        fingerprint.update(f'{app_label}.{migration_name}'.encode())
+
+        with open(path, 'rb') as f:
+            fingerprint.update(f.read())
+
+    return fingerprint.hexdigest()[:16]
+
+
+def get_snapshot_dir():
+    """
+    Returns the directory to keep snapshots in. Unless TWD_TEST_SNAPSHOT_DIR is set, each project gets its own directory in the system's temporary directory.
+    The directory is named after the project's location, so snapshots for one copy of Rango don't replace those for another (one for each chapter, say).
+    """
+    if SNAPSHOT_DIR:
+        return SNAPSHOT_DIR
+
+    project_dir = str(getattr(settings, 'BASE_DIR', os.getcwd()))
+    project_hash = hashlib.sha256(f'{os.path.abspath(project_dir)}|{settings.ROOT_URLCONF}'.encode()).hexdigest()[:12]
+    return os.path.join(DEFAULT_SNAPSHOT_ROOT, f'{os.path.basename(os.path.normpath(project_dir))}-{project_hash}')
+
+
+def remove_database_files(path):
+    """
+    Removes an SQLite database file, along with its journal, if they exist.
+    """
+    for database_path in [path, f'{path}-journal']:
+        if os.path.isfile(database_path):
+            os.remove(database_path)
+
+
+def is_usable_snapshot(path):
+    """
+    Checks that a snapshot file exists and can be opened as a migrated SQLite database.
+    """
+    if not os.path.isfile(path):
+        return False
+
+    try:
+        snapshot = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+
+        try:
+            snapshot.execute('SELECT COUNT(*) FROM django_migrations').fetchone()
+        finally:
+            snapshot.close()
+    except sqlite3.Error:
+        return False
+
+    return True
+
+
+class SnapshotTestRunner(TimedTestRunner):
+    """
+    A TimedTestRunner that creates SQLite test databases from a pre-migrated snapshot, rather than migrating them from scratch.
+    When the snapshot is missing (or the migrations have changed), the test database is migrated as normal and a new snapshot is saved.
+    Parallel workers (--parallel) are cloned by Django from the test database, as usual.
+    For anything other than SQLite -- or when --keepdb is used, which already skips migrating -- this behaves exactly like the TimedTestRunner.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.snapshot_dir = None
+        self.snapshot_aliases = []
+
+    def get_database_aliases(self, **kwargs):
+        return list(kwargs.get('aliases', connections))
+
+    def can_use_snapshots(self, aliases):
+        if self.keepdb:
+            return False
+
+        for alias in aliases:
+            if connections[alias].vendor != 'sqlite':
+                return False
+
+        return True
+
+    def setup_databases(self, **kwargs):
+        aliases = self.get_database_aliases(**kwargs)
+
+        if not self.can_use_snapshots(aliases):
+            return super().setup_databases(**kwargs)
+
+        self.snapshot_dir = get_snapshot_dir()
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        fingerprint = get_migrations_fingerprint()
+        missing_snapshots = []
+
+        for alias in aliases:
+            test_settings = connections[alias].settings_dict['TEST']
+            snapshot_path = os.path.join(self.snapshot_dir, f'{alias}-{fingerprint}.sqlite3')
+            run_path = os.path.join(self.snapshot_dir, f'{alias}-run-{os.getpid()}.sqlite3')
+
+            self.snapshot_aliases.append((alias, test_settings.get('NAME'), snapshot_path, run_path))
+            test_settings['NAME'] = run_path
+
+            try:
+                if not is_usable_snapshot(snapshot_path):
+                    raise FileNotFoundError(snapshot_path)
+
+                shutil.copyfile(snapshot_path, run_path)
+            except FileNotFoundError:  # Missing, or replaced by another run since we checked.
+                missing_snapshots.append(alias)
+
+        if missing_snapshots:
+            if self.verbosity >= 1:
+                print(f"No usable test database snapshot for {', '.join(missing_snapshots)}; migrating from scratch. A snapshot will be saved for next time.")
+
+            # Every database is migrated from scratch, so the snapshot copies made for the other aliases go.
+            # Otherwise Django finds them, and (without --noinput) asks whether it should delete the 'old' test database.
+            for alias, old_test_name, snapshot_path, run_path in self.snapshot_aliases:
+                remove_database_files(run_path)
+
+            old_config = super().setup_databases(**kwargs)
+            self.save_snapshots(missing_snapshots)
+            return old_config
+
+        # Every database starts from a snapshot copy. With keepdb on, Django opens the copy and its migrate run finds nothing to do.
+        self.keepdb = True
+
+        try:
+            return super().setup_databases(**kwargs)
+        finally:
+            self.keepdb = False
+
+    def save_snapshots(self, aliases):
+        """
+        Copies the freshly migrated test database for each of the given aliases into the snapshot directory.
+        Older snapshots for the same alias are removed, as they can no longer be used.
+        """
+        for alias, old_test_name, snapshot_path, run_path in self.snapshot_aliases:
+            if alias not in aliases:
+                continue
+
+            partial_path = f'{snapshot_path}.{os.getpid()}.partial'
+            shutil.copyfile(run_path, partial_path)
+            os.replace(partial_path, snapshot_path)
+
+            for filename in os.listdir(self.snapshot_dir):
+                path = os.path.join(self.snapshot_dir, filename)
+
+                if filename.startswith(f'{alias}-') and filename.endswith('.sqlite3') and '-run-' not in filename and path != snapshot_path:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass  # Another run got there first.
+
+    def teardown_databases(self, old_config, **kwargs):
+        # Work out where the parallel clones are while the connections still point at the test databases.
+        run_files = []
+
+        for alias, old_test_name, snapshot_path, run_path in self.snapshot_aliases:
+            creation = connections[alias].creation
+            run_files.append(run_path)
+            run_files.extend(creation.get_test_db_clone_settings(str(index + 1))['NAME'] for index in range(self.parallel))
+
+        super().teardown_databases(old_config, **kwargs)
+
+        # Run files (and any clones) are left behind when the keepdb path was taken; tidy them up either way.
+        for path in run_files:
+            remove_database_files(path)
+
+        for alias, old_test_name, snapshot_path, run_path in self.snapshot_aliases:
+            connections[alias].settings_dict['TEST']['NAME'] = old_test_name
+
+        self.snapshot_aliases = []